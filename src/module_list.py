@@ -794,6 +794,9 @@ ext_modules = [
     Extension('sage.matrix.matrix_complex_double_dense',
               sources = ['sage/matrix/matrix_complex_double_dense.pyx']),
 
+    Extension('sage.matrix.matrix_cdv_dense_helpers',
+              sources = ['sage/matrix/matrix_cdv_dense_helpers.pyx']),
+
     Extension('sage.matrix.matrix_cyclo_dense',
               sources = ['sage/matrix/matrix_cyclo_dense.pyx'],
               language = "c++",
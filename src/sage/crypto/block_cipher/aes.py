@@ -0,0 +1,448 @@
+r"""
+AES
+
+The Advanced Encryption Standard.
+
+This file provides the Advanced Encryption Standard as specified in
+[U.S2001]_. In contrast to the other ciphers in this package, it does not
+reimplement the round function in Sage: all work is delegated to OpenSSL
+through the optional ``cryptography`` package, so bulk encryption uses the
+AES instructions of the CPU where available. Use it instead of
+:mod:`sage.crypto.block_cipher.des` whenever an experiment merely needs a
+fast pseudorandom permutation rather than DES itself.
+
+EXAMPLES:
+
+Encrypt a message (test vector from Appendix C of [U.S2001]_)::
+
+    sage: from sage.crypto.block_cipher.aes import AES
+    sage: aes = AES()
+    sage: K = 0x000102030405060708090a0b0c0d0e0f
+    sage: P = 0x00112233445566778899aabbccddeeff
+    sage: C = aes.encrypt(plaintext=P, key=K); C.hex()  # optional - cryptography
+    '69c4e0d86a7b0430d8cdb78070b4c55a'
+
+And decrypt it again::
+
+    sage: aes.decrypt(ciphertext=C, key=K) == P  # optional - cryptography
+    True
+
+The 192- and 256-bit variants are selected through ``keySize``::
+
+    sage: aes = AES(keySize=256)
+    sage: K = 0x000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f
+    sage: aes.encrypt(P, K).hex()  # optional - cryptography
+    '8ea2b7ca516745bfeafc49904b496089'
+
+REFERENCES:
+
+- [U.S2001]_
+
+.. NOTE::
+
+    This module requires the optional ``cryptography`` package. Install it
+    with ``sage -pip install cryptography``.
+"""
+
+# ****************************************************************************
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#                  https://www.gnu.org/licenses/
+# ****************************************************************************
+from sage.structure.sage_object import SageObject
+from sage.rings.integer_ring import ZZ
+from sage.modules.free_module_element import vector
+from sage.rings.finite_rings.finite_field_constructor import GF
+from sage.modules.vector_mod2_dense import Vector_mod2_dense
+from six import integer_types
+from sage.rings.integer import Integer
+
+
+class AES(SageObject):
+    r"""
+    This class implements AES described in [U.S2001]_.
+
+    INPUT:
+
+    - ``keySize`` -- integer (default: ``128``); the key length in bits.
+      Must be 128, 192 or 256.
+
+    EXAMPLES:
+
+    You can invoke AES encryption/decryption either by calling AES with an
+    appropriate flag::
+
+        sage: from sage.crypto.block_cipher.aes import AES
+        sage: aes = AES()
+        sage: P = 0x3243f6a8885a308d313198a2e0370734
+        sage: K = 0x2b7e151628aed2a6abf7158809cf4f3c
+        sage: aes(P, K, 'encrypt').hex()  # optional - cryptography
+        '3925841d02dc09fbdc118597196a0b32'
+        sage: aes(0x3925841d02dc09fbdc118597196a0b32, K, 'decrypt') == P  # optional - cryptography
+        True
+
+    Or by calling encryption/decryption methods directly::
+
+        sage: C = aes.encrypt(P, K)  # optional - cryptography
+        sage: P == aes.decrypt(C, K)  # optional - cryptography
+        True
+
+    The number of rounds is determined by the key size and cannot be
+    changed, since the actual computation happens inside OpenSSL. For
+    round-reduced experiments use the pure Sage ciphers in this package.
+
+    Use :meth:`hardware_accelerated` to check whether the CPU advertises
+    AES instructions; without them OpenSSL falls back to a slower
+    software implementation.
+
+    .. SEEALSO::
+
+        :class:`sage.crypto.block_cipher.des.DES`
+
+    .. automethod:: __init__
+    .. automethod:: __call__
+    """
+
+    def __init__(self, keySize=128):
+        r"""
+        Construct an instance of AES.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: AES()
+            AES block cipher with 128-bit keys
+            sage: AES(keySize=192)
+            AES block cipher with 192-bit keys
+            sage: AES(keySize=42)
+            Traceback (most recent call last):
+            ...
+            ValueError: keySize must be 128, 192 or 256 and not 42
+        """
+        if keySize not in (128, 192, 256):
+            raise ValueError('keySize must be 128, 192 or 256 and not %s'
+                             % keySize)
+        self._keySize = keySize
+        self._blocksize = 128
+
+    def __call__(self, block, key, algorithm='encrypt'):
+        r"""
+        Apply AES encryption or decryption on ``block`` using ``key``. The
+        flag ``algorithm`` controls what action is to be performed on
+        ``block``.
+
+        INPUT:
+
+        - ``block`` -- integer or bit list-like; the plaintext or ciphertext
+
+        - ``key`` -- integer or bit list-like; the key
+
+        - ``algorithm`` -- string (default: ``'encrypt'``); a flag to signify
+          whether encryption or decryption is to be applied to ``block``. The
+          encryption flag is ``'encrypt'`` and the decryption flag is
+          ``'decrypt'``
+
+        OUTPUT:
+
+        - The plaintext or ciphertext corresponding to ``block``, obtained
+          using ``key``. If ``block`` is an integer the output will be too.
+          If ``block`` is list-like the output will be a bit vector.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: aes = AES()
+            sage: P = 0x00112233445566778899aabbccddeeff
+            sage: K = 0x000102030405060708090a0b0c0d0e0f
+            sage: aes(P, K, 'encrypt').hex()  # optional - cryptography
+            '69c4e0d86a7b0430d8cdb78070b4c55a'
+
+        TESTS::
+
+            sage: aes(P, K, 'cryptanalyze')
+            Traceback (most recent call last):
+            ...
+            ValueError: Algorithm must be 'encrypt' or 'decrypt' and not 'cryptanalyze'
+        """
+        if algorithm == 'encrypt':
+            return self.encrypt(block, key)
+        elif algorithm == 'decrypt':
+            return self.decrypt(block, key)
+        else:
+            raise ValueError('Algorithm must be \'encrypt\' or \'decrypt\' and'
+                             ' not \'%s\'' % algorithm)
+
+    def __eq__(self, other):
+        r"""
+        Compare ``self`` with ``other``.
+
+        AES objects are the same if all attributes are the same.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: AES() == AES()
+            True
+            sage: AES() == AES(keySize=192)
+            False
+            sage: AES() == 42
+            False
+        """
+        if not isinstance(other, AES):
+            return False
+        else:
+            return self.__dict__ == other.__dict__
+
+    def __repr__(self):
+        r"""
+        A string representation of this AES.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: AES() # indirect doctest
+            AES block cipher with 128-bit keys
+        """
+        return 'AES block cipher with %s-bit keys' % self._keySize
+
+    def hardware_accelerated(self):
+        r"""
+        Return whether the CPU advertises AES instructions, i.e. whether
+        encryption with this class can be expected to run in hardware.
+
+        This is a best-effort check based on ``/proc/cpuinfo``; OpenSSL
+        makes the final choice of implementation. On platforms without
+        ``/proc/cpuinfo`` the answer is ``False`` even though a
+        hardware-accelerated implementation may still be used.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: AES().hardware_accelerated() in (True, False)
+            True
+        """
+        return _hardware_aes_available()
+
+    def encrypt(self, plaintext, key):
+        r"""
+        Return the ciphertext corresponding to ``plaintext``, using AES
+        encryption with ``key``.
+
+        INPUT:
+
+        - ``plaintext`` -- integer or bit list-like; the plaintext that will
+          be encrypted
+
+        - ``key`` -- integer or bit list-like; the key
+
+        OUTPUT:
+
+        - The ciphertext corresponding to ``plaintext``, obtained using
+          ``key``. If ``plaintext`` is an integer the output will be too. If
+          ``plaintext`` is list-like the output will be a bit vector.
+
+        EXAMPLES:
+
+        Encrypt a message (test vector from Appendix C of [U.S2001]_)::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: aes = AES()
+            sage: K = 0x000102030405060708090a0b0c0d0e0f
+            sage: P = 0x00112233445566778899aabbccddeeff
+            sage: aes.encrypt(P, K).hex()  # optional - cryptography
+            '69c4e0d86a7b0430d8cdb78070b4c55a'
+
+        TESTS:
+
+        The 192-bit test vector from Appendix C of [U.S2001]_ and agreement
+        between the integer and the bit-vector interface::
+
+            sage: from sage.crypto.block_cipher.aes import convert_to_vector
+            sage: aes = AES(keySize=192)
+            sage: K = 0x000102030405060708090a0b0c0d0e0f1011121314151617
+            sage: aes.encrypt(P, K).hex()  # optional - cryptography
+            'dda97ca4864cdfe06eaf70a0ec0d7191'
+            sage: Pv = convert_to_vector(P, 128)
+            sage: Kv = convert_to_vector(K, 192)
+            sage: C = aes.encrypt(Pv, Kv)  # optional - cryptography
+            sage: ZZ(list(C)[::-1], 2) == aes.encrypt(P, K)  # optional - cryptography
+            True
+        """
+        if isinstance(plaintext, (list, tuple, Vector_mod2_dense)):
+            inputType = 'vector'
+        elif isinstance(plaintext, integer_types + (Integer,)):
+            inputType = 'integer'
+        block = self._to_bytes(plaintext, self._blocksize)
+        op = _cipher(self._to_bytes(key, self._keySize)).encryptor()
+        state = ZZ(int.from_bytes(op.update(block) + op.finalize(), 'big'))
+        return state if inputType == 'integer' else \
+            convert_to_vector(state, self._blocksize)
+
+    def decrypt(self, ciphertext, key):
+        r"""
+        Return the plaintext corresponding to ``ciphertext``, using AES
+        decryption with ``key``.
+
+        INPUT:
+
+        - ``ciphertext`` -- integer or bit list-like; the ciphertext that
+          will be decrypted
+
+        - ``key`` -- integer or bit list-like; the key
+
+        OUTPUT:
+
+        - The plaintext corresponding to ``ciphertext``, obtained using
+          ``key``. If ``ciphertext`` is an integer the output will be too. If
+          ``ciphertext`` is list-like the output will be a bit vector.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: aes = AES()
+            sage: K = 0x000102030405060708090a0b0c0d0e0f
+            sage: C = 0x69c4e0d86a7b0430d8cdb78070b4c55a
+            sage: aes.decrypt(C, K).hex()  # optional - cryptography
+            '112233445566778899aabbccddeeff'
+        """
+        if isinstance(ciphertext, (list, tuple, Vector_mod2_dense)):
+            inputType = 'vector'
+        elif isinstance(ciphertext, integer_types + (Integer,)):
+            inputType = 'integer'
+        block = self._to_bytes(ciphertext, self._blocksize)
+        op = _cipher(self._to_bytes(key, self._keySize)).decryptor()
+        state = ZZ(int.from_bytes(op.update(block) + op.finalize(), 'big'))
+        return state if inputType == 'integer' else \
+            convert_to_vector(state, self._blocksize)
+
+    def encrypt_many(self, plaintexts, key):
+        r"""
+        Return the list of ciphertexts corresponding to ``plaintexts``,
+        using AES encryption with ``key``.
+
+        All blocks are handed to OpenSSL in a single call, so this is the
+        fastest way to encrypt bulk data with this class.
+
+        INPUT:
+
+        - ``plaintexts`` -- iterable of integers; the plaintext blocks
+
+        - ``key`` -- integer or bit list-like; the key
+
+        OUTPUT:
+
+        - The list of ciphertexts as integers.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: aes = AES()
+            sage: K = 0x2b7e151628aed2a6abf7158809cf4f3c
+            sage: C = aes.encrypt_many(range(4), K)  # optional - cryptography
+            sage: C == [aes.encrypt(P, K) for P in range(4)]  # optional - cryptography
+            True
+        """
+        data = b''.join(self._to_bytes(p, self._blocksize)
+                        for p in plaintexts)
+        op = _cipher(self._to_bytes(key, self._keySize)).encryptor()
+        out = op.update(data) + op.finalize()
+        return [ZZ(int.from_bytes(out[i:i+16], 'big'))
+                for i in range(0, len(out), 16)]
+
+    def _to_bytes(self, x, L):
+        r"""
+        Convert the integer or bit list-like ``x`` to its big-endian
+        ``L``-bit byte representation.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.aes import AES
+            sage: AES()._to_bytes(0x0102, 32)
+            b'\x00\x00\x01\x02'
+            sage: AES()._to_bytes(vector(GF(2), 8, [0,0,0,0,0,1,0,1]), 8)
+            b'\x05'
+        """
+        if isinstance(x, (list, tuple, Vector_mod2_dense)):
+            x = ZZ(list(convert_to_vector(x, L))[::-1], 2)
+        return int(x).to_bytes(L // 8, 'big')
+
+
+def _cipher(key):
+    r"""
+    Return a ``cryptography`` cipher object for AES in ECB mode under the
+    byte string ``key``.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.aes import _cipher
+        sage: c = _cipher(bytes(16))  # optional - cryptography
+        sage: c.encryptor().update(bytes(16)).hex()  # optional - cryptography
+        '66e94bd4ef8a2c3b884cfa59ca342b2e'
+    """
+    try:
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives.ciphers import (Cipher,
+                                                            algorithms,
+                                                            modes)
+    except ImportError:
+        raise ImportError('AES requires the optional cryptography package; '
+                          'install it with: sage -pip install cryptography')
+    return Cipher(algorithms.AES(key), modes.ECB(),
+                  backend=default_backend())
+
+
+def _hardware_aes_available():
+    r"""
+    Return whether the CPU advertises AES instructions.
+
+    This is a best-effort check based on ``/proc/cpuinfo``; on platforms
+    without it ``False`` is returned even though OpenSSL may still pick a
+    hardware-accelerated implementation.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.aes import _hardware_aes_available
+        sage: _hardware_aes_available() in (True, False)
+        True
+    """
+    try:
+        with open('/proc/cpuinfo') as f:
+            return any(line.startswith('flags') and 'aes' in line.split()
+                       for line in f)
+    except IOError:
+        return False
+
+
+def convert_to_vector(I, L):
+    r"""
+    Convert ``I`` to a bit vector of length ``L``.
+
+    INPUT:
+
+    - ``I`` -- integer or bit list-like
+
+    - ``L`` -- integer; the desired bit length of the ouput
+
+    OUTPUT:
+
+    - the ``L``-bit vector representation of ``I``
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.aes import convert_to_vector
+        sage: convert_to_vector(0x1F, 8)
+        (0, 0, 0, 1, 1, 1, 1, 1)
+        sage: v = vector(GF(2), 4, [1,0,1,0])
+        sage: convert_to_vector(v, 4)
+        (1, 0, 1, 0)
+    """
+    try:
+        state = vector(GF(2), L, ZZ(I).digits(2, padto=L)[::-1])
+        return state
+    except TypeError:
+        # ignore the error and try list-like types
+        pass
+    state = vector(GF(2), L, [0]*(L-len(I))+list(I))
+    return state
@@ -89,6 +89,7 @@ from sage.crypto.sboxes import DES_S6_1, DES_S6_2, DES_S6_3, DES_S6_4
 from sage.crypto.sboxes import DES_S7_1, DES_S7_2, DES_S7_3, DES_S7_4
 from sage.crypto.sboxes import DES_S8_1, DES_S8_2, DES_S8_3, DES_S8_4
 from itertools import chain
+from collections import OrderedDict
 
 
 sboxes = [[DES_S1_1, DES_S1_2, DES_S1_3, DES_S1_4],
@@ -100,6 +101,36 @@ sboxes = [[DES_S1_1, DES_S1_2, DES_S1_3, DES_S1_4],
           [DES_S7_1, DES_S7_2, DES_S7_3, DES_S7_4],
           [DES_S8_1, DES_S8_2, DES_S8_3, DES_S8_4]]
 
+# Bit positions (1-based, MSB first) of the permutations used in DES. These
+# are shared by the generic bit-vector methods and the integer-based fast
+# path below.
+_IP_POSITIONS = [58, 50, 42, 34, 26, 18, 10, 2,
+                 60, 52, 44, 36, 28, 20, 12, 4,
+                 62, 54, 46, 38, 30, 22, 14, 6,
+                 64, 56, 48, 40, 32, 24, 16, 8,
+                 57, 49, 41, 33, 25, 17,  9, 1,
+                 59, 51, 43, 35, 27, 19, 11, 3,
+                 61, 53, 45, 37, 29, 21, 13, 5,
+                 63, 55, 47, 39, 31, 23, 15, 7]
+
+_INV_IP_POSITIONS = [40, 8, 48, 16, 56, 24, 64, 32,
+                     39, 7, 47, 15, 55, 23, 63, 31,
+                     38, 6, 46, 14, 54, 22, 62, 30,
+                     37, 5, 45, 13, 53, 21, 61, 29,
+                     36, 4, 44, 12, 52, 20, 60, 28,
+                     35, 3, 43, 11, 51, 19, 59, 27,
+                     34, 2, 42, 10, 50, 18, 58, 26,
+                     33, 1, 41,  9, 49, 17, 57, 25]
+
+_P_POSITIONS = [16,  7, 20, 21,
+                29, 12, 28, 17,
+                 1, 15, 23, 26,
+                 5, 18, 31, 10,
+                 2,  8, 24, 14,
+                32, 27,  3,  9,
+                19, 13, 30,  6,
+                22, 11,  4, 25]
+
 
 class DES(SageObject):
     r"""
@@ -429,14 +460,20 @@ class DES(SageObject):
             sage: K = 0x025816164629B007
             sage: des(P, K, 'encrypt').hex()
             'a1f9915541020b56'
+
+        TESTS::
+
+            sage: des(P, K, 'cryptanalyze')
+            Traceback (most recent call last):
+            ...
+            ValueError: Algorithm must be 'encrypt' or 'decrypt' and not 'cryptanalyze'
         """
-        if algorithm == 'encrypt':
-            return self.encrypt(block, key)
-        elif algorithm == 'decrypt':
-            return self.decrypt(block, key)
-        else:
+        try:
+            op = self._dispatch[algorithm]
+        except KeyError:
             raise ValueError('Algorithm must be \'encrypt\' or \'decrypt\' and'
                              ' not \'%s\'' % algorithm)
+        return op(self, block, key)
 
     def __eq__(self, other):
         r"""
@@ -511,11 +548,47 @@ class DES(SageObject):
             sage: des = DES(keySize=56)
             sage: des.encrypt(P, K56) == C
             True
+
+        TESTS:
+
+        The integer-based fast path gives the same results as the generic
+        bit-vector implementation::
+
+            sage: from sage.crypto.block_cipher.des import convert_to_vector
+            sage: des = DES()
+            sage: P = 0x480D39006EE762F2
+            sage: K = 0x025816164629B007
+            sage: Pv = convert_to_vector(P, 64)
+            sage: Kv = convert_to_vector(K, 64)
+            sage: ZZ(list(des.encrypt(Pv, Kv))[::-1], 2) == des.encrypt(P, K)
+            True
+
+        Repeated encryptions under one key reuse the cached key
+        expansion::
+
+            sage: des = DES()
+            sage: _ = des.encrypt(0, 0x133457799BBCDFF1)
+            sage: hex(des.keySchedule._expandedKey)
+            '0x133457799bbcdff1'
+            sage: des.encrypt(1, 0x133457799BBCDFF1).hex()
+            '5d59d44607495a7a'
         """
         if isinstance(plaintext, (list, tuple, Vector_mod2_dense)):
             inputType = 'vector'
         elif isinstance(plaintext, integer_types + (Integer,)):
             inputType = 'integer'
+        if (inputType == 'integer' and
+                isinstance(key, integer_types + (Integer,)) and
+                self.sboxes is sboxes and
+                isinstance(self.keySchedule, DES_KS)):
+            # fast path operating on plain integers; the S-box and
+            # permutation layers are table lookups here
+            if self._keySize == 56:
+                key = _insert_parity_bits(key)
+            roundKeys = self.keySchedule._round_keys(key)
+            return ZZ(_des_block(int(plaintext),
+                                 list(roundKeys[:self._rounds]),
+                                 self._doFinalRound))
         state = convert_to_vector(plaintext, self._blocksize)
         key = convert_to_vector(key, self._keySize)
         if self._keySize == 56:
@@ -533,6 +606,167 @@ class DES(SageObject):
             state = self._inv_ip(state)
         return state if inputType == 'vector' else ZZ(list(state)[::-1], 2)
 
+    def encrypt_many(self, plaintexts, key):
+        r"""
+        Return the ciphertexts corresponding to the integers in
+        ``plaintexts``, using DES encryption with ``key``.
+
+        In contrast to calling :meth:`encrypt` once per block, the key
+        schedule is run only once and shared by all blocks, so the cost
+        per block is just the 16 rounds themselves.
+
+        INPUT:
+
+        - ``plaintexts`` -- iterable of integers; the plaintexts that will
+          be encrypted
+
+        - ``key`` -- integer or bit list-like; the key
+
+        OUTPUT:
+
+        - A list containing the ciphertexts corresponding to
+          ``plaintexts``, obtained using ``key``.
+
+        EXAMPLES:
+
+        Encrypt several blocks under one key::
+
+            sage: from sage.crypto.block_cipher.des import DES
+            sage: des = DES()
+            sage: K = 0x133457799BBCDFF1
+            sage: C = des.encrypt_many(range(3), K)
+            sage: [c.hex() for c in C]
+            ['948a43f98a834f7e', '5d59d44607495a7a', 'a488bebad8a16be']
+
+        TESTS::
+
+            sage: des.encrypt_many(range(3), K) == [des.encrypt(P, K)
+            ....:                                   for P in range(3)]
+            True
+        """
+        if not (self.sboxes is sboxes and
+                isinstance(self.keySchedule, DES_KS)):
+            # customised cipher internals; fall back to the generic path
+            return [self.encrypt(P, key) for P in plaintexts]
+        if not isinstance(key, integer_types + (Integer,)):
+            key = ZZ(list(convert_to_vector(key, self._keySize))[::-1], 2)
+        if self._keySize == 56:
+            key = _insert_parity_bits(key)
+        roundKeys = list(self.keySchedule._round_keys(key)[:self._rounds])
+        doFinalRound = self._doFinalRound
+        return [ZZ(_des_block(int(P), roundKeys, doFinalRound))
+                for P in plaintexts]
+
+    def compile_for_key(self, key):
+        r"""
+        Return an encryption function specialised for ``key``.
+
+        The returned function takes a single integer plaintext and
+        returns the corresponding ciphertext. The key schedule is run
+        once at specialisation time and each round key is folded into a
+        private copy of the S-box lookup tables, so the per-block work
+        consists of table lookups only. The last 16 specialised
+        functions are cached, keyed on the key and the cipher
+        parameters.
+
+        INPUT:
+
+        - ``key`` -- integer or bit list-like; the key
+
+        OUTPUT:
+
+        - A function mapping an integer plaintext to the corresponding
+          integer ciphertext under ``key``.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.des import DES
+            sage: des = DES()
+            sage: K = 0x133457799BBCDFF1
+            sage: enc = des.compile_for_key(K)
+            sage: enc(0x0123456789ABCDEF).hex()
+            '85e813540f0ab405'
+
+        TESTS::
+
+            sage: all(enc(P) == des.encrypt(P, K) for P in range(16))
+            True
+            sage: des.compile_for_key(K) is enc
+            True
+        """
+        if not (self.sboxes is sboxes and
+                isinstance(self.keySchedule, DES_KS)):
+            # customised cipher internals cannot be specialised
+            return lambda block: self.encrypt(block, key)
+        if not isinstance(key, integer_types + (Integer,)):
+            key = ZZ(list(convert_to_vector(key, self._keySize))[::-1], 2)
+        cacheKey = (ZZ(key), self._keySize, self._rounds,
+                    self._doFinalRound)
+        try:
+            func = _KERNEL_CACHE.pop(cacheKey)
+        except KeyError:
+            key64 = _insert_parity_bits(key) if self._keySize == 56 else key
+            roundKeys = list(
+                self.keySchedule._round_keys(key64)[:self._rounds])
+            func = _compile_kernel(roundKeys, self._doFinalRound)
+        _KERNEL_CACHE[cacheKey] = func
+        while len(_KERNEL_CACHE) > 16:
+            _KERNEL_CACHE.popitem(last=False)
+        return func
+
+    def encrypt_counter(self, key, counter=0, n=1):
+        r"""
+        Return the encryptions of the ``n`` counter blocks ``counter``,
+        ``counter + 1``, ..., ``counter + n - 1`` as a single byte
+        string.
+
+        This is the keystream of DES in counter mode, useful when the
+        cipher serves as a building block for PRFs or as a randomness
+        source. The blocks are produced by the specialised function from
+        :meth:`compile_for_key`, so only the counter increment and the
+        byte conversion are paid per block on top of the rounds
+        themselves. The counter wraps around modulo `2^{64}`.
+
+        INPUT:
+
+        - ``key`` -- integer or bit list-like; the key
+
+        - ``counter`` -- integer (default: ``0``); the value of the first
+          counter block
+
+        - ``n`` -- integer (default: ``1``); the number of blocks
+
+        OUTPUT:
+
+        - The ``8*n`` bytes of the concatenated ciphertext blocks, in big
+          endian order.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.des import DES
+            sage: des = DES()
+            sage: K = 0x133457799BBCDFF1
+            sage: des.encrypt_counter(K, counter=0, n=2).hex()
+            '948a43f98a834f7e5d59d44607495a7a'
+
+        TESTS:
+
+        The keystream consists of the encryptions of the consecutive
+        counter values, and the counter wraps at `2^{64}`::
+
+            sage: S = des.encrypt_counter(K, counter=5, n=3)
+            sage: S == b''.join(int(des.encrypt(b, K)).to_bytes(8, 'big')
+            ....:               for b in range(5, 8))
+            True
+            sage: des.encrypt_counter(K, counter=2^64 - 1, n=2)[8:] == \
+            ....:     des.encrypt_counter(K, n=1)
+            True
+        """
+        enc = self.compile_for_key(key)
+        mask = (1 << 64) - 1
+        return b''.join(int(enc((counter + i) & mask)).to_bytes(8, 'big')
+                        for i in range(n))
+
     def decrypt(self, ciphertext, key):
         r"""
         Return the plaintext corresponding to ``ciphertext``, using DES
@@ -568,11 +802,34 @@ class DES(SageObject):
             sage: des = DES(keySize=56)
             sage: des.decrypt(C, K56).hex() == P
             True
+
+        TESTS:
+
+        The integer-based fast path gives the same results as the generic
+        bit-vector implementation::
+
+            sage: from sage.crypto.block_cipher.des import convert_to_vector
+            sage: des = DES()
+            sage: C = 0xA1F9915541020B56
+            sage: K = 0x025816164629B007
+            sage: Cv = convert_to_vector(C, 64)
+            sage: Kv = convert_to_vector(K, 64)
+            sage: ZZ(list(des.decrypt(Cv, Kv))[::-1], 2) == des.decrypt(C, K)
+            True
         """
         if isinstance(ciphertext, (list, tuple, Vector_mod2_dense)):
             inputType = 'vector'
         elif isinstance(ciphertext, integer_types + (Integer,)):
             inputType = 'integer'
+        if (inputType == 'integer' and
+                isinstance(key, integer_types + (Integer,)) and
+                self.sboxes is sboxes and
+                isinstance(self.keySchedule, DES_KS)):
+            if self._keySize == 56:
+                key = _insert_parity_bits(key)
+            roundKeys = self.keySchedule._round_keys(key)
+            return ZZ(_des_block(int(ciphertext),
+                                 list(roundKeys[:self._rounds])[::-1]))
         state = convert_to_vector(ciphertext, 64)
         key = convert_to_vector(key, self._keySize)
         if self._keySize == 56:
@@ -589,6 +846,10 @@ class DES(SageObject):
         state = self._inv_ip(state)
         return state if inputType == 'vector' else ZZ(list(state)[::-1], 2)
 
+    # direct dispatch for __call__, avoiding the string comparisons on
+    # every invocation
+    _dispatch = {'encrypt': encrypt, 'decrypt': decrypt}
+
     def _ip(self, block):
         r"""
         Return the initial permutation of ``block``.
@@ -606,15 +867,7 @@ class DES(SageObject):
              0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 0, 1, 0,
              1, 0, 1, 0, 1, 1, 1, 1, 0, 0, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0)
         """
-        IP = [58, 50, 42, 34, 26, 18, 10, 2,
-              60, 52, 44, 36, 28, 20, 12, 4,
-              62, 54, 46, 38, 30, 22, 14, 6,
-              64, 56, 48, 40, 32, 24, 16, 8,
-              57, 49, 41, 33, 25, 17,  9, 1,
-              59, 51, 43, 35, 27, 19, 11, 3,
-              61, 53, 45, 37, 29, 21, 13, 5,
-              63, 55, 47, 39, 31, 23, 15, 7]
-        return vector(GF(2), 64, [block[i-1] for i in IP])
+        return vector(GF(2), 64, [block[i-1] for i in _IP_POSITIONS])
 
     def round(self, state, round_key):
         r"""
@@ -718,15 +971,7 @@ class DES(SageObject):
             (0, 0, 1, 0, 0, 0, 1, 1, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0,
              0, 1, 1, 0, 1, 1, 1, 0, 1, 1)
         """
-        P = [16,  7, 20, 21,
-             29, 12, 28, 17,
-              1, 15, 23, 26,
-              5, 18, 31, 10,
-              2,  8, 24, 14,
-             32, 27,  3,  9,
-             19, 13, 30,  6,
-             22, 11,  4, 25]
-        return vector(GF(2), 32, [block[i-1] for i in P])
+        return vector(GF(2), 32, [block[i-1] for i in _P_POSITIONS])
 
     def _inv_ip(self, block):
         r"""
@@ -745,15 +990,7 @@ class DES(SageObject):
              1, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0,
              1, 0, 1, 0, 1, 0, 1, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1)
         """
-        invIP = [40, 8, 48, 16, 56, 24, 64, 32,
-                 39, 7, 47, 15, 55, 23, 63, 31,
-                 38, 6, 46, 14, 54, 22, 62, 30,
-                 37, 5, 45, 13, 53, 21, 61, 29,
-                 36, 4, 44, 12, 52, 20, 60, 28,
-                 35, 3, 43, 11, 51, 19, 59, 27,
-                 34, 2, 42, 10, 50, 18, 58, 26,
-                 33, 1, 41,  9, 49, 17, 57, 25]
-        return vector(GF(2), 64, [block[i-1] for i in invIP])
+        return vector(GF(2), 64, [block[i-1] for i in _INV_IP_POSITIONS])
 
 
 class DES_KS(SageObject):
@@ -815,6 +1052,10 @@ class DES_KS(SageObject):
         self._rounds = rounds
         self._masterKey = masterKey
         self._keySize = 64
+        # cached key expansion: the master key it belongs to and the
+        # round keys as a tuple of plain 48-bit integers
+        self._expandedKey = None
+        self._expanded = None
 
     def __call__(self, key):
         r"""
@@ -832,9 +1073,8 @@ class DES_KS(SageObject):
 
         EXAMPLES:
 
-        This implementation is using bit vectors for all internal
-        representations. So you can invoke the key schedule with a bit
-        vector::
+        The key schedule computes with integers internally, but it
+        mirrors the input type. So you can invoke it with a bit vector::
 
             sage: from sage.crypto.block_cipher.des import DES_KS
             sage: K = vector(GF(2),[0,0,0,1,0,0,1,1,0,0,1,1,0,1,0,0,0,1,0,1,0,
@@ -868,25 +1108,42 @@ class DES_KS(SageObject):
             If you want to use a DES_KS object as an iterable you have to
             pass a ``masterKey`` value on initialisation. Otherwise you can
             omit ``masterKey`` and pass a key when you call the object.
+
+        TESTS:
+
+        The expanded schedule is kept as a tuple of plain 48-bit integers
+        and reused as long as the key does not change::
+
+            sage: ks = DES_KS()
+            sage: _ = ks(0x133457799bbcdff1)
+            sage: hex(ks._expanded[0])
+            '0x1b02effc7072'
+            sage: ks(0x133457799bbcdff1)[0].hex()
+            '1b02effc7072'
         """
         if isinstance(key, (list, tuple, Vector_mod2_dense)):
             inputType = 'vector'
+            key = ZZ(list(convert_to_vector(key, self._keySize))[::-1], 2)
         elif isinstance(key, integer_types + (Integer,)):
             inputType = 'integer'
-        key = convert_to_vector(key, self._keySize)
-        roundKeys = []
-        C, D = self._pc1(key)
-        for i in range(16):
-            C, D = self._left_shift(C, i), self._left_shift(D, i)
-            roundKeys.append(self._pc2(list(C)+list(D)))
-        return roundKeys if inputType == 'vector' else [ZZ(list(k)[::-1], 2)
-                                                        for k in roundKeys]
+        key = int(key)
+        if key != self._expandedKey:
+            roundKeys = []
+            C, D = self._pc1(key)
+            for i in range(16):
+                C, D = self._left_shift(C, i), self._left_shift(D, i)
+                roundKeys.append(self._pc2((C << 28) | D))
+            self._expandedKey = key
+            self._expanded = tuple(roundKeys)
+        return [ZZ(k) for k in self._expanded] if inputType == 'integer' \
+            else [convert_to_vector(k, 48) for k in self._expanded]
 
     def __eq__(self, other):
         r"""
         Compare ``self`` with ``other``.
 
-        DES_KS objects are the same if all attributes are the same.
+        DES_KS objects are the same if all attributes are the same. The
+        cached key expansion is ignored.
 
         EXAMPLES::
 
@@ -895,11 +1152,19 @@ class DES_KS(SageObject):
             True
             sage: DES_KS() == DES_KS(11) # indirect doctest
             False
+            sage: ks1, ks2 = DES_KS(), DES_KS()
+            sage: _ = ks1(0x133457799bbcdff1)
+            sage: ks1 == ks2 # indirect doctest
+            True
         """
         if not isinstance(other, DES_KS):
             return False
         else:
-            return self.__dict__ == other.__dict__
+            d1 = {k: v for k, v in self.__dict__.items()
+                  if k not in ('_expandedKey', '_expanded')}
+            d2 = {k: v for k, v in other.__dict__.items()
+                  if k not in ('_expandedKey', '_expanded')}
+            return d1 == d2
 
     def __repr__(self):
         r"""
@@ -954,24 +1219,38 @@ class DES_KS(SageObject):
             raise ValueError('Key not set during initialisation')
         return iter(self(self._masterKey))
 
+    def _round_keys(self, key):
+        r"""
+        Return the round keys for the integer ``key`` as a tuple of plain
+        48-bit Python integers.
+
+        In contrast to :meth:`__call__` this does not build a fresh list
+        of Sage integers, so repeated encryptions under one key do no
+        per-call work in the key schedule at all.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.block_cipher.des import DES_KS
+            sage: hex(DES_KS()._round_keys(0x133457799bbcdff1)[0])
+            '0x1b02effc7072'
+        """
+        key = int(key)
+        if key != self._expandedKey:
+            self(key)
+        return self._expanded
+
     def _pc1(self, key):
         r"""
-        Return Permuted Choice 1 of ``key``.
+        Return Permuted Choice 1 of the 64-bit integer ``key`` as a pair
+        of 28-bit integers `(C, D)`.
 
         EXAMPLES::
 
             sage: from sage.crypto.block_cipher.des import DES_KS
             sage: ks = DES_KS()
-            sage: K = vector(GF(2),[0,0,0,1,0,0,1,1,0,0,1,1,0,1,0,0,0,1,0,1,0,
-            ....:                   1,1,1,0,1,1,1,1,0,0,1,1,0,0,1,1,0,1,1,1,0,
-            ....:                   1,1,1,1,0,0,1,1,0,1,1,1,1,1,1,1,1,1,0,0,0,1])
-            sage: C, D = ks._pc1(K)
-            sage: C
-            (1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 0, 1, 0,
-             1, 0, 1, 1, 1, 1)
-            sage: D
-            (0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 1, 1, 1, 0,
-             0, 0, 1, 1, 1, 1)
+            sage: C, D = ks._pc1(0x133457799BBCDFF1)
+            sage: hex(C), hex(D)
+            ('0xf0ccaaf', '0x556678f')
         """
         PC1_C = [57, 49, 41, 33, 25, 17,  9,
                   1, 58, 50, 42, 34, 26, 18,
@@ -981,25 +1260,19 @@ class DES_KS(SageObject):
                   7, 62, 54, 46, 38, 30, 22,
                  14,  6, 61, 53, 45, 37, 29,
                  21, 13,  5, 28, 20, 12,  4]
-        C = vector(GF(2), 28, [key[i-1] for i in PC1_C])
-        D = vector(GF(2), 28, [key[i-1] for i in PC1_D])
-        return C, D
+        return _permute(key, 64, PC1_C), _permute(key, 64, PC1_D)
 
     def _pc2(self, key):
         r"""
-        Return Permuted Choice 2 of ``key``.
+        Return Permuted Choice 2 of the 56-bit integer ``key`` as a
+        48-bit integer.
 
         EXAMPLES::
 
             sage: from sage.crypto.block_cipher.des import DES_KS
             sage: ks = DES_KS()
-            sage: K = vector(GF(2),[1,1,1,0,0,0,0,1,1,0,0,1,1,0,0,1,0,1,0,1,0,
-            ....:                   1,0,1,1,1,1,1,1,0,1,0,1,0,1,0,1,1,0,0,1,1,
-            ....:                   0,0,1,1,1,1,0,0,0,1,1,1,1,0])
-            sage: ks._pc2(K)
-            (0, 0, 0, 1, 1, 0, 1, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1, 1,
-             1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 1, 1, 1,
-             0, 0, 1, 0)
+            sage: hex(ks._pc2(0xE19955FAACCF1E))
+            '0x1b02effc7072'
         """
         PC2 = [14, 17, 11, 24,  1,  5,
                 3, 28, 15,  6, 21, 10,
@@ -1009,28 +1282,25 @@ class DES_KS(SageObject):
                30, 40, 51, 45, 33, 48,
                44, 49, 39, 56, 34, 53,
                46, 42, 50, 36, 29, 32]
-        return vector(GF(2), 48, [key[i-1] for i in PC2])
+        return _permute(key, 56, PC2)
 
     def _left_shift(self, half, i):
         r"""
-        Shift ``half`` one or two positions to the left depending on the
-        iteration number ``i``.
+        Rotate the 28-bit integer ``half`` one or two positions to the
+        left depending on the iteration number ``i``.
 
         EXAMPLES::
 
             sage: from sage.crypto.block_cipher.des import DES_KS
             sage: ks = DES_KS()
-            sage: bits = vector(GF(2), 6, [1,0,1,0,1,0])
-            sage: ks._left_shift(bits, 0)
-            (0, 1, 0, 1, 0, 1)
-            sage: bits
-            (1, 0, 1, 0, 1, 0)
-            sage: ks._left_shift(bits, 2)
-            (1, 0, 1, 0, 1, 0)
+            sage: hex(ks._left_shift(0xF0CCAAF, 0))
+            '0xe19955f'
+            sage: hex(ks._left_shift(0xF0CCAAF, 2))
+            '0xc332abf'
         """
         amount = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
-        return vector(GF(2),
-                      list(half[amount[i]:]) + list(half[0:amount[i]]))
+        s = amount[i]
+        return ((half << s) | (half >> (28 - s))) & 0x0FFFFFFF
 
 
 def convert_to_vector(I, L):
@@ -1064,3 +1334,265 @@ def convert_to_vector(I, L):
         pass
     state = vector(GF(2), L, [0]*(L-len(I))+list(I))
     return state
+
+
+def _permute(x, bits, positions):
+    r"""
+    Apply the permutation given by ``positions`` to the ``bits``-bit
+    integer ``x``.
+
+    The entries of ``positions`` are the usual 1-based DES bit positions,
+    i.e. position 1 denotes the most significant bit.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _permute, _IP_POSITIONS
+        sage: hex(_permute(0x0123456789ABCDEF, 64, _IP_POSITIONS))
+        '0xcc00ccfff0aaf0aa'
+    """
+    y = 0
+    for p in positions:
+        y = (y << 1) | ((x >> (bits - p)) & 1)
+    return y
+
+
+_SP_TABLES = None
+
+
+def _sp_tables():
+    r"""
+    Return eight lookup tables fusing the DES S-boxes with the
+    permutation `P`.
+
+    Table ``i`` maps the 6-bit input of S-box ``i+1`` to a 32-bit integer
+    holding the 4 output bits at their position after `P`. The tables are
+    computed from :obj:`sboxes` on first use and cached.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _sp_tables
+        sage: tables = _sp_tables()
+        sage: len(tables), len(tables[0])
+        (8, 64)
+        sage: hex(tables[0][0])
+        '0x808200'
+    """
+    global _SP_TABLES
+    if _SP_TABLES is None:
+        tables = []
+        for i in range(8):
+            table = []
+            for x in range(64):
+                row = 2 * (x >> 5) + (x & 1)
+                out = int(sboxes[i][row]((x >> 1) & 0xF))
+                table.append(_permute(out << (28 - 4*i), 32, _P_POSITIONS))
+            tables.append(tuple(table))
+        _SP_TABLES = tuple(tables)
+    return _SP_TABLES
+
+
+_IP_TABLES = None
+_INV_IP_TABLES = None
+
+
+def _byte_tables(positions):
+    r"""
+    Return byte-indexed lookup tables realising the 64-bit permutation
+    given by ``positions``.
+
+    Table ``i`` maps the value of input byte ``i`` (counting from the
+    most significant byte) to a 64-bit integer holding those eight bits
+    at their permuted positions; the full permutation is the bitwise or
+    of the eight lookups, see :func:`_permute64`.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _byte_tables
+        sage: from sage.crypto.block_cipher.des import _IP_POSITIONS
+        sage: tables = _byte_tables(_IP_POSITIONS)
+        sage: len(tables), len(tables[0])
+        (8, 256)
+    """
+    return tuple(tuple(_permute(v << (56 - 8*byte), 64, positions)
+                       for v in range(256))
+                 for byte in range(8))
+
+
+def _permute64(x, tables):
+    r"""
+    Apply a 64-bit permutation given by byte-indexed lookup ``tables``
+    (see :func:`_byte_tables`) to the 64-bit integer ``x``.
+
+    This replaces the 64-iteration bit gather of :func:`_permute` by
+    eight table lookups.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _permute64, _ip_tables
+        sage: hex(_permute64(0x0123456789ABCDEF, _ip_tables()))
+        '0xcc00ccfff0aaf0aa'
+    """
+    return (tables[0][x >> 56] |
+            tables[1][(x >> 48) & 0xFF] |
+            tables[2][(x >> 40) & 0xFF] |
+            tables[3][(x >> 32) & 0xFF] |
+            tables[4][(x >> 24) & 0xFF] |
+            tables[5][(x >> 16) & 0xFF] |
+            tables[6][(x >> 8) & 0xFF] |
+            tables[7][x & 0xFF])
+
+
+def _ip_tables():
+    r"""
+    Return the byte-indexed lookup tables of the initial permutation,
+    computed on first use and cached.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _ip_tables
+        sage: hex(_ip_tables()[7][0xFF])
+        '0x8080808080808080'
+    """
+    global _IP_TABLES
+    if _IP_TABLES is None:
+        _IP_TABLES = _byte_tables(_IP_POSITIONS)
+    return _IP_TABLES
+
+
+def _inv_ip_tables():
+    r"""
+    Return the byte-indexed lookup tables of the final (inverse initial)
+    permutation, computed on first use and cached.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _inv_ip_tables
+        sage: from sage.crypto.block_cipher.des import _ip_tables, _permute64
+        sage: x = 0x0123456789ABCDEF
+        sage: _permute64(_permute64(x, _ip_tables()), _inv_ip_tables()) == x
+        True
+    """
+    global _INV_IP_TABLES
+    if _INV_IP_TABLES is None:
+        _INV_IP_TABLES = _byte_tables(_INV_IP_POSITIONS)
+    return _INV_IP_TABLES
+
+
+def _f32(right, subkey):
+    r"""
+    Apply the cipher function to the 32-bit integer ``right`` and the
+    48-bit integer ``subkey``.
+
+    This is the integer counterpart of :meth:`DES._f`; the E-expansion is
+    realised by reading overlapping 6-bit windows of ``right`` and the
+    S-box and permutation layers are a single table lookup per S-box.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _f32
+        sage: hex(_f32(0xF0AAF0AA, 0x1B02EFFC7072))
+        '0x234aa9bb'
+    """
+    tables = _sp_tables()
+    # 34-bit window holding bit 32, bits 1..32 and bit 1 of ``right``, so
+    # that the E-expansion of S-box i is the 6-bit slice at offset 4*i
+    w = ((right & 1) << 33) | (right << 1) | (right >> 31)
+    out = 0
+    for i in range(8):
+        out |= tables[i][((w >> (28 - 4*i)) & 0x3F)
+                         ^ ((subkey >> (42 - 6*i)) & 0x3F)]
+    return out
+
+
+def _des_block(block, roundKeys, doFinalRound=True):
+    r"""
+    Apply the DES rounds given by the integer ``roundKeys`` to the 64-bit
+    integer ``block``.
+
+    This is the fast path used by :meth:`DES.encrypt` and
+    :meth:`DES.decrypt` for integer inputs; decryption is encryption with
+    the round keys reversed.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _des_block, DES_KS
+        sage: rk = [int(k) for k in DES_KS()(0x133457799BBCDFF1)]
+        sage: hex(_des_block(0x0123456789ABCDEF, rk))
+        '0x85e813540f0ab405'
+        sage: hex(_des_block(0x85E813540F0AB405, rk[::-1]))
+        '0x123456789abcdef'
+    """
+    state = _permute64(block, _ip_tables())
+    L, R = state >> 32, state & 0xFFFFFFFF
+    for K in roundKeys:
+        L, R = R, L ^ _f32(R, K)
+    if doFinalRound:
+        return _permute64((R << 32) | L, _inv_ip_tables())
+    return (L << 32) | R
+
+
+# cache of the most recently compiled per-key kernels, see
+# :meth:`DES.compile_for_key`
+_KERNEL_CACHE = OrderedDict()
+
+
+def _compile_kernel(roundKeys, doFinalRound=True):
+    r"""
+    Return an encryption function with the integer ``roundKeys`` baked in.
+
+    For every round the 6-bit key chunks are pre-XORed into a private
+    copy of the fused S-box tables, so the round function of the returned
+    closure is eight table lookups without any key material left.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _compile_kernel, DES_KS
+        sage: rk = [int(k) for k in DES_KS()(0x133457799BBCDFF1)]
+        sage: enc = _compile_kernel(rk)
+        sage: hex(enc(0x0123456789ABCDEF))
+        '0x85e813540f0ab405'
+    """
+    tables = _sp_tables()
+    keyed = tuple(tuple(tuple(t[x ^ ((K >> (42 - 6*i)) & 0x3F)]
+                              for x in range(64))
+                        for i, t in enumerate(tables))
+                  for K in roundKeys)
+    perm = _permute64
+    ip = _ip_tables()
+    fp = _inv_ip_tables()
+
+    def encrypt_fixed_key(block):
+        state = perm(int(block), ip)
+        L, R = state >> 32, state & 0xFFFFFFFF
+        for t in keyed:
+            w = ((R & 1) << 33) | (R << 1) | (R >> 31)
+            L, R = R, L ^ (t[0][(w >> 28) & 0x3F] |
+                           t[1][(w >> 24) & 0x3F] |
+                           t[2][(w >> 20) & 0x3F] |
+                           t[3][(w >> 16) & 0x3F] |
+                           t[4][(w >> 12) & 0x3F] |
+                           t[5][(w >> 8) & 0x3F] |
+                           t[6][(w >> 4) & 0x3F] |
+                           t[7][w & 0x3F])
+        if doFinalRound:
+            return ZZ(perm((R << 32) | L, fp))
+        return ZZ((L << 32) | R)
+
+    return encrypt_fixed_key
+
+
+def _insert_parity_bits(key):
+    r"""
+    Expand the 56-bit integer ``key`` to 64 bits by inserting a zero
+    'parity' bit after every 7 key bits.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.block_cipher.des import _insert_parity_bits
+        sage: hex(_insert_parity_bits(0x12695BC9B7B7F8))
+        '0x123456789abcdef0'
+    """
+    key64 = 0
+    for i in range(8):
+        key64 |= ((key >> (49 - 7*i)) & 0x7F) << (57 - 8*i)
+    return key64
@@ -0,0 +1,385 @@
+r"""
+Smith normal form of dense matrices over complete discrete valuation rings
+
+This module implements an iterative Smith normal form reduction for dense
+matrices over complete discrete valuation rings and fields, e.g. `\ZZ_p`
+and `\QQ_p`. At every step the pivot is chosen as an entry of smallest
+valuation in the remaining submatrix; when the base ring tracks precision
+this is the numerically stable choice.
+
+EXAMPLES::
+
+    sage: from sage.matrix.matrix_cdv_dense import smith_normal_form
+    sage: R = Zp(5, prec=10)
+    sage: M = matrix(R, 3, 3, [2, 1, 5, 0, 3, 1, 25, 1, 7])
+    sage: S, L, U = smith_normal_form(M)
+    sage: S.diagonal()
+    [1 + O(5^10), 1 + O(5^10), 5 + O(5^10)]
+    sage: S == L * M * U
+    True
+"""
+
+# ****************************************************************************
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#                  https://www.gnu.org/licenses/
+# ****************************************************************************
+
+from sage.rings.infinity import Infinity
+from sage.rings.integer_ring import ZZ
+from sage.matrix.matrix_cdv_dense_helpers import _find_pivot
+
+# sentinel used in place of Infinity when the valuations are kept in a
+# machine integer array
+_INF64 = 2**62
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+    _find_min_valuation = None
+else:
+    try:
+        from numba import njit
+    except ImportError:
+        _find_min_valuation = None
+    else:
+        @njit(cache=True)
+        def _find_min_valuation(vals, piv, n, m, target):
+            # compiled counterpart of _find_pivot working on an int64
+            # array; documented and wrapped by _ValuationCache.find_pivot
+            pivi = piv
+            pivj = piv
+            curval = _INF64
+            for i in range(piv, n):
+                for j in range(piv, m):
+                    v = vals[i, j]
+                    if v < curval:
+                        pivi = i
+                        pivj = j
+                        curval = v
+                        if v == target:
+                            return pivi, pivj, curval
+            return pivi, pivj, curval
+
+
+class _ValuationCache(object):
+    r"""
+    Cache of the valuations of the entries of the working matrix of
+    :func:`smith_normal_form`.
+
+    The valuations are kept in a structure of their own, apart from the
+    matrix, so that the pivot search never constructs ring elements.
+    When numpy is available and the valuations are machine integers they
+    are stored in a numpy ``int64`` array (with a large sentinel standing
+    in for ``Infinity``) and searched by a numba-compiled loop, or -- if
+    numba is not installed -- by a branch-free vectorised ``argmin`` over
+    the contiguous subarray. Otherwise they are stored in nested Python
+    lists and searched by the Cython helper
+    :func:`~sage.matrix.matrix_cdv_dense_helpers._find_pivot`. All three
+    searches pick the same pivot: the first entry of minimal valuation
+    in row-major order.
+
+    EXAMPLES::
+
+        sage: from sage.matrix.matrix_cdv_dense import _ValuationCache
+        sage: S = matrix(Zp(5), 2, 2, [5, 1, 25, 0])
+        sage: V = _ValuationCache(S, 2, 2)
+        sage: V.find_pivot(0, -Infinity)
+        (0, 1, 0)
+        sage: V.swap_rows(0, 1)
+        sage: V.find_pivot(0, -Infinity)
+        (1, 1, 0)
+    """
+
+    def __init__(self, S, n, m):
+        r"""
+        Initialize the cache with the valuations of the entries of ``S``.
+
+        TESTS::
+
+            sage: from sage.matrix.matrix_cdv_dense import _ValuationCache
+            sage: S = matrix(Zp(5), 1, 1)
+            sage: _ValuationCache(S, 1, 1).find_pivot(0, -Infinity)
+            (0, 0, +Infinity)
+        """
+        self._n = n
+        self._m = m
+        self._array = None
+        if numpy is not None:
+            try:
+                arr = numpy.empty((n, m), dtype=numpy.int64)
+                for i in range(n):
+                    for j in range(m):
+                        v = S[i, j].valuation()
+                        arr[i, j] = _INF64 if v is Infinity else v
+                self._array = arr
+            except (TypeError, ValueError, OverflowError):
+                # valuations are not machine integers
+                self._array = None
+        if self._array is None:
+            self._rows = [[S[i, j].valuation() for j in range(m)]
+                          for i in range(n)]
+
+    def find_pivot(self, piv, target):
+        r"""
+        Return ``(pivi, pivj, curval)`` locating an entry of smallest
+        valuation ``curval`` in the submatrix with corner ``(piv, piv)``.
+
+        The search stops as soon as an entry of valuation ``target`` is
+        found.
+
+        EXAMPLES::
+
+            sage: from sage.matrix.matrix_cdv_dense import _ValuationCache
+            sage: S = matrix(Zp(5), 2, 2, [5, 1, 25, 125])
+            sage: _ValuationCache(S, 2, 2).find_pivot(1, -Infinity)
+            (1, 1, 3)
+        """
+        if self._array is not None:
+            if _find_min_valuation is not None:
+                t = -_INF64 if target is -Infinity else int(target)
+                pivi, pivj, v = _find_min_valuation(self._array, piv,
+                                                    self._n, self._m, t)
+                return pivi, pivj, Infinity if v >= _INF64 else ZZ(v)
+            # ``argmin`` returns the first minimum in row-major order,
+            # which matches the tie-breaking of the scalar loops. The
+            # early exit on ``target`` is lost, but the scan itself is
+            # branch-free and runs entirely inside numpy.
+            sub = self._array[piv:, piv:]
+            k = int(sub.argmin())
+            w = self._m - piv
+            pivi = piv + k // w
+            pivj = piv + k % w
+            v = int(self._array[pivi, pivj])
+            return pivi, pivj, Infinity if v >= _INF64 else ZZ(v)
+        return _find_pivot(self._rows, piv, self._n, self._m, target)
+
+    def swap_rows(self, i, j):
+        r"""
+        Swap the cached valuations of rows ``i`` and ``j``.
+
+        EXAMPLES::
+
+            sage: from sage.matrix.matrix_cdv_dense import _ValuationCache
+            sage: V = _ValuationCache(matrix(Zp(5), 2, 2, [5, 5, 1, 5]), 2, 2)
+            sage: V.swap_rows(0, 1)
+            sage: V.find_pivot(0, -Infinity)
+            (0, 0, 0)
+        """
+        if self._array is not None:
+            arr = self._array
+            arr[[i, j], :] = arr[[j, i], :]
+        else:
+            rows = self._rows
+            rows[i], rows[j] = rows[j], rows[i]
+
+    def swap_columns(self, i, j):
+        r"""
+        Swap the cached valuations of columns ``i`` and ``j``.
+
+        EXAMPLES::
+
+            sage: from sage.matrix.matrix_cdv_dense import _ValuationCache
+            sage: V = _ValuationCache(matrix(Zp(5), 2, 2, [5, 1, 5, 5]), 2, 2)
+            sage: V.swap_columns(0, 1)
+            sage: V.find_pivot(0, -Infinity)
+            (0, 0, 0)
+        """
+        if self._array is not None:
+            arr = self._array
+            arr[:, [i, j]] = arr[:, [j, i]]
+        else:
+            for row in self._rows:
+                row[i], row[j] = row[j], row[i]
+
+    def refresh_block(self, block, row0, col0):
+        r"""
+        Recompute the cached valuations of the submatrix with upper left
+        corner ``(row0, col0)`` from ``block``, which holds its new
+        entries.
+
+        The entries are read off ``block`` in one sweep via ``list()``,
+        so no per-entry matrix access is needed.
+
+        EXAMPLES::
+
+            sage: from sage.matrix.matrix_cdv_dense import _ValuationCache
+            sage: S = matrix(Zp(5), 2, 2, [5, 1, 25, 125])
+            sage: V = _ValuationCache(S, 2, 2)
+            sage: V.refresh_block(matrix(Zp(5), 1, 1, [1]), 1, 1)
+            sage: V.find_pivot(1, -Infinity)
+            (1, 1, 0)
+        """
+        entries = block.list()
+        bn = block.nrows()
+        bm = block.ncols()
+        if self._array is not None:
+            arr = self._array
+            k = 0
+            for i in range(row0, row0 + bn):
+                for j in range(col0, col0 + bm):
+                    v = entries[k].valuation()
+                    arr[i, j] = _INF64 if v is Infinity else v
+                    k += 1
+        else:
+            rows = self._rows
+            k = 0
+            for i in range(row0, row0 + bn):
+                rows[i][col0:col0 + bm] = [x.valuation()
+                                           for x in entries[k:k + bm]]
+                k += bm
+
+
+def smith_normal_form(M, transformation=True):
+    r"""
+    Return the Smith normal form of ``M``.
+
+    The diagonal entries of the Smith normal form are powers of the
+    uniformizer of the base ring, with non-decreasing valuations along
+    the diagonal. Over an inexact ring they are returned with precision
+    capped at the minimal absolute precision of the entries of ``M``.
+
+    INPUT:
+
+    - ``M`` -- a dense matrix over a complete discrete valuation ring
+      or field
+
+    - ``transformation`` -- boolean (default: ``True``); whether the
+      transformation matrices are returned
+
+    OUTPUT:
+
+    - The Smith normal form `S` of ``M``. If ``transformation`` is
+      ``True``, invertible matrices `L` and `U` with `S = L M U` are
+      returned as well.
+
+    EXAMPLES::
+
+        sage: from sage.matrix.matrix_cdv_dense import smith_normal_form
+        sage: R = Zp(5, prec=10)
+        sage: M = matrix(R, 3, 3, [2, 1, 5, 0, 3, 1, 25, 1, 7])
+        sage: S, L, U = smith_normal_form(M)
+        sage: S.diagonal()
+        [1 + O(5^10), 1 + O(5^10), 5 + O(5^10)]
+        sage: S == L * M * U
+        True
+
+    The transformation matrices are invertible over the ring::
+
+        sage: L.determinant().valuation(), U.determinant().valuation()
+        (0, 0)
+
+    Rectangular matrices are supported, and the transformation matrices
+    can be omitted::
+
+        sage: M = matrix(R, 2, 3, [5, 1, 10, 0, 25, 6])
+        sage: smith_normal_form(M, transformation=False).diagonal()
+        [1 + O(5^10), 1 + O(5^10)]
+
+    Over a field the valuations may be negative::
+
+        sage: K = Qp(5, prec=10)
+        sage: M = matrix(K, 2, 2, [1/5, 1, 1, 6])
+        sage: S, L, U = smith_normal_form(M)
+        sage: S.diagonal()
+        [5^-1 + O(5^9), 1 + O(5^9)]
+        sage: S == L * M * U
+        True
+
+    TESTS::
+
+        sage: M = matrix(R, 2, 2)
+        sage: smith_normal_form(M, transformation=False) == 0
+        True
+        sage: S, L, U = smith_normal_form(M)
+        sage: S == L * M * U
+        True
+
+    .. TODO::
+
+        The row eliminations of one pivot step are independent of each
+        other and are already issued as a single block operation. They
+        could additionally run on several threads, but only once the
+        entries themselves live in a machine representation; this is
+        sound solely for fixed-modulus rings whose modulus fits in a
+        machine word, where elements are plain residues without
+        per-element precision. For generic entries the work happens in
+        ring-element arithmetic under the interpreter lock, so threads
+        would not help.
+    """
+    n = M.nrows()
+    m = M.ncols()
+    R = M.base_ring()
+    S = M.__copy__()
+    smith = M.parent()(0)
+    pi = R.uniformizer()
+    # R is fixed for the whole computation, so test once whether it
+    # tracks precision instead of re-entering the ring on every scalar
+    tracks = not R.is_exact()
+    precM = Infinity
+    if tracks and n and m:
+        # _list() exposes the entries without copying and the generator
+        # avoids materialising the precisions
+        precM = min(x.precision_absolute() for x in M._list())
+    if transformation:
+        left = M.new_matrix(n, n, 1)
+        right = M.new_matrix(m, m, 1)
+    # cache of the valuations of the entries of S; the pivot search works
+    # on this structure instead of re-entering the matrix dispatch
+    vals = _ValuationCache(S, n, m)
+    val = -Infinity
+    for piv in range(min(n, m)):
+        # find an entry of smallest valuation in S[piv:, piv:]; no entry
+        # can have valuation less than the previous pivot, so the search
+        # stops early when one of equal valuation is found
+        pivi, pivj, val = vals.find_pivot(piv, val)
+        if val is Infinity or val >= precM:
+            # the remaining block is zero (at working precision)
+            break
+        S.swap_rows(pivi, piv)
+        vals.swap_rows(pivi, piv)
+        S.swap_columns(pivj, piv)
+        vals.swap_columns(pivj, piv)
+        if transformation:
+            left.swap_rows(pivi, piv)
+            right.swap_columns(pivj, piv)
+        if tracks:
+            smith[piv, piv] = (pi ** val).add_bigoh(precM)
+        else:
+            smith[piv, piv] = pi ** val
+        inv = ~(S[piv, piv] >> val)
+        if piv < n - 1:
+            # eliminate the column below the pivot with a single block
+            # update S[piv+1:, piv+1:] += c * S[piv, piv+1:] instead of
+            # one add_multiple_of_row call per row
+            col_shift = [S[i, piv] >> val for i in range(piv + 1, n)]
+            scalars = [-inv * s for s in col_shift]
+            if tracks:
+                scalars = [s.lift_to_precision() for s in scalars]
+            c = S.new_matrix(n - piv - 1, 1, scalars)
+            if piv < m - 1:
+                pivrow = S.submatrix(piv, piv + 1, 1, m - piv - 1)
+                block = S.submatrix(piv + 1, piv + 1) + c * pivrow
+                S.set_block(piv + 1, piv + 1, block)
+                # refresh only the entries touched by the update
+                vals.refresh_block(block, piv + 1, piv + 1)
+            if transformation:
+                left.set_block(piv + 1, 0, left.submatrix(piv + 1, 0)
+                               + c * left.submatrix(piv, 0, 1, n))
+        if transformation:
+            left.rescale_row(piv, inv)
+            # compute each quotient of the pivot row once and reuse it
+            row_shift = [S[piv, j] >> val for j in range(piv + 1, m)]
+            scalars = [inv * s for s in row_shift]
+            if tracks:
+                scalars = [s.lift_to_precision() for s in scalars]
+            for j, scalar in enumerate(scalars):
+                right.add_multiple_of_column(piv + 1 + j, piv, -scalar)
+    if transformation:
+        if tracks:
+            left = left.apply_map(lambda x: x.lift_to_precision())
+        return smith, left, right
+    return smith
@@ -0,0 +1,56 @@
+# cython: boundscheck=False, wraparound=False
+r"""
+Helpers for Smith normal form computations over complete discrete
+valuation rings
+
+The functions in this module implement the tight inner loops of
+:mod:`sage.matrix.matrix_cdv_dense` on plain Python containers, removing
+the interpreter dispatch from per-entry operations. The valuations
+themselves stay generic Python objects, since they may be ``Infinity``.
+"""
+
+# ****************************************************************************
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#                  https://www.gnu.org/licenses/
+# ****************************************************************************
+
+from sage.rings.infinity import Infinity
+
+
+cpdef tuple _find_pivot(list vals, Py_ssize_t piv, Py_ssize_t n,
+                        Py_ssize_t m, target):
+    r"""
+    Return ``(pivi, pivj, curval)`` such that ``vals[pivi][pivj]`` is an
+    entry of smallest valuation ``curval`` among ``vals[i][j]`` with
+    ``piv <= i < n`` and ``piv <= j < m``.
+
+    The search stops as soon as an entry of valuation ``target`` is
+    found, since no entry can have a smaller valuation than the
+    previous pivot.
+
+    EXAMPLES::
+
+        sage: from sage.matrix.matrix_cdv_dense_helpers import _find_pivot
+        sage: _find_pivot([[2, 1], [0, 3]], 0, 2, 2, -Infinity)
+        (1, 0, 0)
+        sage: _find_pivot([[2, 1], [0, 3]], 1, 2, 2, 0)
+        (1, 1, 3)
+    """
+    cdef Py_ssize_t i, j
+    cdef Py_ssize_t pivi = piv, pivj = piv
+    cdef list row
+    curval = Infinity
+    for i in range(piv, n):
+        row = vals[i]
+        for j in range(piv, m):
+            v = row[j]
+            if v < curval:
+                pivi = i
+                pivj = j
+                curval = v
+                if v == target:
+                    return pivi, pivj, curval
+    return pivi, pivj, curval